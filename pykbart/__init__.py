@@ -3,4 +3,5 @@ from .exceptions import *
 from .holdings import *
 from .kbartrecord import *
 from .reader import *
+from .schema import *
 from .writer import *
\ No newline at end of file
@@ -32,3 +32,8 @@ PROVIDER_FIELDS = {
 }
 
 
+HOLDINGS_FIELDS = (
+    'date_first_issue_online', 'num_first_vol_online',
+    'num_first_issue_online', 'date_last_issue_online',
+    'num_last_vol_online', 'num_last_issue_online'
+)
@@ -22,3 +22,15 @@ class UnknownEmbargoFormat(Exception):
 class IncompleteDateInformation(Exception):
     def __str__(self):
         return 'Insufficient date information to calculate coverage length.'
+
+
+class UnrecognizedHeader(Exception):
+    def __str__(self):
+        return ('Header row does not begin with the KBART Recommended '
+                'Practice fields. Check that the file is a KBART file.\n')
+
+
+class HeaderMismatch(Exception):
+    def __str__(self):
+        return ('Header row does not match the Recommended Practice or '
+                'provider the file was opened with.\n')
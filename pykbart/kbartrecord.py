@@ -3,15 +3,17 @@
 
 from __future__ import (absolute_import, division,
                         print_function, unicode_literals)
-from collections import OrderedDict, MutableMapping
+try:
+    from collections.abc import MutableMapping
+except ImportError:
+    from collections import MutableMapping
 
 import six
 
 from pykbart.holdings import (coverage_begins, coverage_begins_text,
                               coverage_ends, coverage_ends_text, embargo_as_dict,
                               coverage_pretty_print, check_embargo)
-from pykbart.constants import RP1_FIELDS, RP2_FIELDS, PROVIDER_FIELDS
-from pykbart.exceptions import InvalidRP, ProviderNotFound
+from pykbart.schema import get_schema, schema_for
 
 
 @six.python_2_unicode_compatible
@@ -22,7 +24,8 @@ class KbartRecord(MutableMapping):
                  data=None,
                  provider=None,
                  rp=2,
-                 fields=None):
+                 fields=None,
+                 schema=None):
         """
         Take or figure out the field names and zip them with values.
 
@@ -39,33 +42,68 @@ class KbartRecord(MutableMapping):
                 be using RP2, but some early adopters, i.e. OCLC, still use
                 RP1.
             fields: Iterable of field names to be attached to data.
-                Will usually be passed from KbartReader class.
+            schema: A KbartSchema describing the fields. Will usually be
+                passed from KbartReader class so every record from a file
+                shares one.
+
+        Whenever the fields identify the Recommended Practice version and
+        provider, those are used; rp and provider are only kept as given
+        for fields that aren't recognised as KBART.
         """
-        self.provider = provider
-        self.rp = rp
         if data:
             self.data = data
         else:
             self.data = []
 
-        if fields:
-            self.fields = fields
-        else:
-            self.fields = self._create_fields()
+        if schema is None:
+            schema = get_schema(fields) if fields else schema_for(rp, provider)
+        if schema.rp is not None:
+            rp, provider = schema.rp, schema.provider
+        self.provider = provider
+        self.rp = rp
+        self._schema = schema
+        self._values = schema.load(self.data)
 
-        self._kbart_data = OrderedDict(six.moves.zip_longest(self.fields,
-                                                             self.data,
-                                                             fillvalue=''))
+    @property
+    def fields(self):
+        return self._schema.fields
+
+    @fields.setter
+    def fields(self, value):
+        """
+        Relabel the record's values, in order, with new field names.
+
+        Extra names get empty values.
+
+        Raises:
+            ValueError: If there are fewer names than values, since the
+                trailing values would be lost.
+        """
+        value = tuple(value)
+        if len(value) < len(self._values):
+            raise ValueError('{0} field names given for {1} values'
+                             .format(len(value), len(self._values)))
+        self._schema = self._schema.relabel(value)
+        self._values = self._schema.load(self._values)
 
     def __getitem__(self, key):
-        """Delegate most work to the OrderedDict held by class."""
-        return self._kbart_data[key]
+        """Look up the field's position in the shared schema."""
+        return self._values[self._schema.positions[key]]
 
     def __setitem__(self, key, value):
-        self._kbart_data[key] = value
+        try:
+            self._values[self._schema.positions[key]] = value
+        except KeyError:
+            self._schema = self._schema.add_field(key)
+            self._values.append(value)
 
     def __delitem__(self, key):
-        del(self._kbart_data[key])
+        if key not in self._schema.positions:
+            raise KeyError(key)
+        self._values = [value for field, value
+                        in zip(self._schema.fields, self._values)
+                        if field != key]
+        self._schema = self._schema.remove_field(key)
 
     def __repr__(self):
         return ('{0}(data={1}, provider={2}, rp={3}, fields={4})'
@@ -73,29 +111,28 @@ class KbartRecord(MutableMapping):
                         six.moves.reprlib.repr([str(x) for x in self.data]),
                         str(self.provider),
                         self.rp,
-                        six.moves.reprlib.repr(self.fields)))
+                        six.moves.reprlib.repr(list(self.fields))))
 
     def __str__(self):
         output = [' -------\n']
-        output.extend([_format_strings(the_string=self._kbart_data[key],
+        output.extend([_format_strings(the_string=self[key],
                                        prefix='{0}: '.format(key),
                                        suffix='\n')
-                      for key in self._kbart_data])
+                      for key in self])
         return ''.join(output)
 
     def __len__(self):
-        return len(self._kbart_data)
+        return len(self._schema.keys)
 
     def __iter__(self):
-        return iter(self._kbart_data)
+        return iter(self._schema.keys)
 
     def get_fields(self, *args):
         """Get values for the listed keys."""
         if not args:
-            return list(self._kbart_data.values())
+            return list(self.values())
 
-        return [self._kbart_data[x] for x in args
-                if x in self._kbart_data]
+        return [self[x] for x in args if x in self._schema.positions]
 
     @property
     def coverage_length(self):
@@ -124,7 +161,7 @@ class KbartRecord(MutableMapping):
 
     @start_date.setter
     def start_date(self, value):
-        self._kbart_data['date_first_issue_online'] = value
+        self['date_first_issue_online'] = value
 
     @property
     def end_date(self):
@@ -133,7 +170,7 @@ class KbartRecord(MutableMapping):
 
     @end_date.setter
     def end_date(self, value):
-        self._kbart_data['date_last_issue_online'] = value
+        self['date_last_issue_online'] = value
 
     @property
     def coverage(self):
@@ -142,70 +179,57 @@ class KbartRecord(MutableMapping):
 
     @property
     def embargo(self):
-        return self._kbart_data['embargo_info']
+        return self['embargo_info']
 
     @embargo.setter
     def embargo(self, value):
         check_embargo(value)
-        self._kbart_data['embargo_info'] = value
+        self['embargo_info'] = value
 
     @property
     def title(self):
-        return self._kbart_data['publication_title']
+        return self['publication_title']
 
     @title.setter
     def title(self, value):
-        self._kbart_data['publication_title'] = value
+        self['publication_title'] = value
 
     @property
     def url(self):
-        return self._kbart_data['title_url']
+        return self['title_url']
 
     @url.setter
     def url(self, value):
-        self._kbart_data['title_url'] = value
+        self['title_url'] = value
 
     @property
     def print_id(self):
-        return self._kbart_data['print_identifier']
+        return self['print_identifier']
 
     @print_id.setter
     def print_id(self, value):
-        self._kbart_data['print_identifier'] = value
+        self['print_identifier'] = value
 
     @property
     def e_id(self):
-        return self._kbart_data['online_identifier']
+        return self['online_identifier']
 
     @e_id.setter
     def e_id(self, value):
-        self._kbart_data['online_identifier'] = value
+        self['online_identifier'] = value
 
     @property
     def publisher(self):
-        return self._kbart_data['publisher_name']
+        return self['publisher_name']
 
     @publisher.setter
     def publisher(self, value):
-        self._kbart_data['publisher_name'] = value
-
-    def _create_fields(self):
-        fields = list(RP1_FIELDS)
-        if int(self.rp) == 2:
-            fields.extend(RP2_FIELDS)
-        elif not int(self.rp) == 1:
-            raise InvalidRP
-
-        if self.provider is not None:
-            try:
-                fields.extend(PROVIDER_FIELDS[self.provider])
-            except KeyError:
-                raise ProviderNotFound
-        return fields
+        self['publisher_name'] = value
 
     @property
     def holdings_fields(self):
-        return list(self._kbart_data.values())[3:9]
+        return [self._values[index] if index is not None else ''
+                for index in self._schema.holdings_indices]
 
 
 def _format_strings(the_string='', prefix='', suffix=''):
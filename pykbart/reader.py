@@ -7,27 +7,52 @@ import contextlib
 import six
 
 from pykbart.kbartrecord import KbartRecord
+from pykbart.schema import detect_schema
 
 import unicodecsv as csv
 
 
 class Reader(six.Iterator):
 
-    def __init__(self, file_handle, delimiter='\t'):
+    def __init__(self, file_handle, delimiter='\t', rp=None, provider=None,
+                 strip_whitespace=False):
+        """
+        Read the header row and work out the file's layout before any
+        records are parsed.
+
+        Args:
+            file_handle: The KBART file, opened in binary mode
+            delimiter: KBART spec specifies tab-delimited
+            rp: Int of the Recommended Practice version the file should
+                follow. If None, it is detected from the header.
+            provider: Provider the file should come from. If None, it is
+                detected from the header.
+            strip_whitespace: Strip surrounding whitespace from date and
+                embargo values before they are stored.
+
+        Raises:
+            UnrecognizedHeader: If the header isn't a KBART header
+            HeaderMismatch: If rp or provider don't match the header
+        """
         self.reader = csv.reader(file_handle, delimiter=delimiter, encoding='utf-8')
-        self.fields = list(six.next(self.reader))
+        self.schema = detect_schema(six.next(self.reader),
+                                    rp=rp, provider=provider,
+                                    strip_whitespace=strip_whitespace)
+        self.fields = list(self.schema.fields)
 
     def __next__(self):
-        return KbartRecord(six.next(self.reader), fields=self.fields)
+        return KbartRecord(six.next(self.reader), schema=self.schema)
 
     def __iter__(self):
         return self
 
 
 @contextlib.contextmanager
-def KbartReader(file_path, delimiter='\t'):
+def KbartReader(file_path, delimiter='\t', rp=None, provider=None,
+                strip_whitespace=False):
     f = open(file_path, 'rb')
     try:
-        yield Reader(f, delimiter=delimiter)
+        yield Reader(f, delimiter=delimiter, rp=rp, provider=provider,
+                     strip_whitespace=strip_whitespace)
     finally:
         f.close()
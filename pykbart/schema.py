@@ -0,0 +1,240 @@
+#!/usr/bin/env python
+"""Compile and cache the field layout shared by records from one file."""
+# coding: utf-8
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+import itertools
+
+import six
+
+from pykbart.constants import (RP1_FIELDS, RP2_FIELDS, PROVIDER_FIELDS,
+                               HOLDINGS_FIELDS)
+from pykbart.exceptions import (InvalidRP, ProviderNotFound,
+                                UnrecognizedHeader, HeaderMismatch)
+
+BOM = '\ufeff'
+
+# Every field name we know about, keyed by its lowercase form so header
+# cells like 'Publication_Title' resolve to the name KbartRecord expects
+_CANONICAL_FIELDS = dict(
+    (field.lower(), field)
+    for field in itertools.chain(RP1_FIELDS, RP2_FIELDS,
+                                 *PROVIDER_FIELDS.values())
+)
+
+_registry = {}
+_rp_registry = {}
+
+
+def _strip(value):
+    return value.strip() if isinstance(value, six.string_types) else value
+
+
+# Converters applied when a schema is built with strip_whitespace=True.
+# Only the fields holdings.py parses are listed; every other field is kept
+# exactly as read.
+FIELD_CONVERTERS = {
+    'date_first_issue_online': _strip,
+    'date_last_issue_online': _strip,
+    'embargo_info': _strip,
+}
+
+
+class KbartSchema(object):
+    """
+    Field layout shared by every KbartRecord read from the same header.
+
+    Use get_schema so that identical headers share one instance. Records
+    that have fields added, removed or relabelled move to a schema derived
+    from this one; derived schemas are cached here rather than in the
+    module registry, so records changed the same way share them and the
+    cache only holds layouts that have actually been reached.
+    """
+
+    __slots__ = ('fields', 'keys', 'positions', 'holdings_indices',
+                 'converters', 'strip_whitespace', 'rp', 'provider',
+                 '_origin', '_transitions')
+
+    def __init__(self, fields, strip_whitespace=False, _origin=None):
+        self.fields = tuple(fields)
+        self.strip_whitespace = strip_whitespace
+        self._origin = _origin
+        self._transitions = {}
+        # Duplicate names keep their first position for ordering but the
+        # last value wins, same as building an OrderedDict from the row
+        self.positions = dict((field, index)
+                              for index, field in enumerate(self.fields))
+        seen = set()
+        self.keys = tuple(field for field in self.fields
+                          if not (field in seen or seen.add(field)))
+        self.holdings_indices = tuple(self.positions.get(field)
+                                      for field in HOLDINGS_FIELDS)
+        self.converters = tuple((index, FIELD_CONVERTERS[field])
+                                for index, field in enumerate(self.fields)
+                                if strip_whitespace and
+                                field in FIELD_CONVERTERS)
+        self.rp, self.provider = _identify(self.fields)
+
+    def __repr__(self):
+        return ('{0}(rp={1}, provider={2}, fields={3})'
+                .format(self.__class__.__name__,
+                        self.rp,
+                        str(self.provider),
+                        six.moves.reprlib.repr(list(self.fields))))
+
+    def __reduce__(self):
+        """Unpickle cached schemas through get_schema so they stay shared."""
+        key = (self.fields, self.strip_whitespace)
+        if _registry.get(key) is self:
+            return get_schema, key
+        if self._origin is not None:
+            return _transition, self._origin
+        return KbartSchema, key
+
+    def add_field(self, field):
+        """Schema with field appended to the end."""
+        return _transition(self, 'add', field)
+
+    def remove_field(self, field):
+        """Schema with every occurrence of field removed."""
+        return _transition(self, 'remove', field)
+
+    def relabel(self, fields):
+        """Schema with the same values under new field names."""
+        return _transition(self, 'relabel', tuple(fields))
+
+    def load(self, data):
+        """
+        Line up a row of data with the schema's fields.
+
+        Short rows are padded with empty strings and values past the last
+        field are dropped.
+
+        Returns: a list of values, one per field
+        """
+        width = len(self.fields)
+        values = list(itertools.islice(data, width))
+        values.extend([''] * (width - len(values)))
+        for index, converter in self.converters:
+            values[index] = converter(values[index])
+        return values
+
+
+def _identify(fields):
+    """
+    Work out the Recommended Practice version and provider from field names.
+
+    Returns: a tuple of (rp, provider). rp is None if the fields don't start
+        with the RP1 fields; provider is None unless all of a known
+        provider's fields follow the standard ones. Local fields after the
+        provider's are allowed.
+    """
+    rp1_width = len(RP1_FIELDS)
+    rp2_width = rp1_width + len(RP2_FIELDS)
+    if fields[:rp1_width] != RP1_FIELDS:
+        return None, None
+    if fields[rp1_width:rp2_width] == RP2_FIELDS:
+        rp, extra_fields = 2, fields[rp2_width:]
+    else:
+        rp, extra_fields = 1, fields[rp1_width:]
+
+    provider = None
+    for name, provider_fields in six.iteritems(PROVIDER_FIELDS):
+        if extra_fields[:len(provider_fields)] == provider_fields:
+            provider = name
+            break
+    return rp, provider
+
+
+def _transition(schema, change, argument):
+    """Look up or build the schema a change to schema's fields leads to."""
+    key = (change, argument)
+    try:
+        return schema._transitions[key]
+    except KeyError:
+        pass
+
+    if change == 'add':
+        fields = schema.fields + (argument,)
+    elif change == 'remove':
+        fields = tuple(field for field in schema.fields if field != argument)
+    else:
+        fields = argument
+    derived = KbartSchema(fields, schema.strip_whitespace,
+                          _origin=(schema, change, argument))
+    return schema._transitions.setdefault(key, derived)
+
+
+def get_schema(fields, strip_whitespace=False):
+    """Return the shared schema for these exact field names."""
+    key = (tuple(fields), strip_whitespace)
+    try:
+        return _registry[key]
+    except KeyError:
+        return _registry.setdefault(key, KbartSchema(*key))
+
+
+def schema_for(rp=2, provider=None):
+    """
+    Build the schema for a Recommended Practice version and provider.
+
+    Raises:
+        InvalidRP: If rp is not 1 or 2
+        ProviderNotFound: If there are no fields defined for the provider
+    """
+    key = (rp, provider)
+    try:
+        return _rp_registry[key]
+    except KeyError:
+        pass
+
+    fields = list(RP1_FIELDS)
+    if int(rp) == 2:
+        fields.extend(RP2_FIELDS)
+    elif not int(rp) == 1:
+        raise InvalidRP
+
+    if provider is not None:
+        try:
+            fields.extend(PROVIDER_FIELDS[provider])
+        except KeyError:
+            raise ProviderNotFound
+    return _rp_registry.setdefault(key, get_schema(fields))
+
+
+def normalize_field(name):
+    """
+    Clean up a header cell: drop any byte order mark and surrounding
+    whitespace, and match known field names regardless of case or spacing.
+    """
+    name = name.replace(BOM, '').strip()
+    return _CANONICAL_FIELDS.get('_'.join(name.lower().split()), name)
+
+
+def detect_schema(header, rp=None, provider=None, strip_whitespace=False):
+    """
+    Compile the header row of a KBART file into a schema.
+
+    Args:
+        header: The first row of the file
+        rp: Int of the Recommended Practice version the file should follow.
+            If None, whatever the header says is accepted.
+        provider: Provider the file should come from. If None, whatever the
+            header says is accepted.
+        strip_whitespace: Strip surrounding whitespace from the date and
+            embargo values, which holdings.py parses. Off by default so
+            values are kept exactly as read.
+
+    Raises:
+        UnrecognizedHeader: If the header doesn't start with the RP1 fields
+        HeaderMismatch: If rp or provider don't match what the header says
+    """
+    schema = get_schema((normalize_field(name) for name in header),
+                        strip_whitespace=strip_whitespace)
+    if schema.rp is None:
+        raise UnrecognizedHeader
+    if ((rp is not None and int(rp) != schema.rp) or
+            (provider is not None and provider != schema.provider)):
+        raise HeaderMismatch
+    return schema
@@ -4,10 +4,20 @@
 from __future__ import (absolute_import, division,
                         print_function, unicode_literals)
 
+import io
 import os.path
 import unittest
 
-from pykbart.reader import KbartReader
+import pytest
+
+from pykbart.constants import RP1_FIELDS, RP2_FIELDS, PROVIDER_FIELDS
+from pykbart.exceptions import HeaderMismatch, UnrecognizedHeader
+from pykbart.reader import KbartReader, Reader
+
+
+def _kbart_file(header, *rows):
+    lines = ['\t'.join(row) for row in (header,) + rows]
+    return io.BytesIO('\n'.join(lines).encode('utf-8'))
 
 
 class TestKbartReader(unittest.TestCase):
@@ -20,6 +30,41 @@ class TestKbartReader(unittest.TestCase):
                 num_of_records += 1
         self.assertEqual(num_of_records, 965)
 
+    def test_detects_rp_and_provider(self):
+        directory = os.path.dirname(os.path.realpath(__file__))
+        with KbartReader(os.path.join(directory, 'printHoldings.txt')) as reader:
+            first, second = next(reader), next(reader)
+        assert (first.rp, first.provider) == (1, 'oclc')
+        assert first.fields is second.fields
+        assert reader.fields == list(first.fields)
+
+    def test_partial_provider_fields_are_not_a_provider(self):
+        header = RP1_FIELDS + ('publisher_name',)
+        assert next(Reader(_kbart_file(header, ['My Journal']))).provider is None
+        with pytest.raises(HeaderMismatch):
+            Reader(_kbart_file(header), provider='oclc')
+
+    def test_provider_fields_followed_by_local_fields(self):
+        header = RP1_FIELDS + PROVIDER_FIELDS['oclc'] + ('local_note',)
+        reader = Reader(_kbart_file(header, ['My Journal']), provider='oclc')
+        assert next(reader).provider == 'oclc'
+
+    def test_header_with_bom_and_case_variants(self):
+        header = ['\ufeffPublication_Title '] + list(RP1_FIELDS[1:] + RP2_FIELDS)
+        header[12] = 'Embargo Info'
+        record = next(Reader(_kbart_file(header, ['My Journal'])))
+        assert record.rp == 2
+        assert record.title == 'My Journal'
+        assert record.embargo == ''
+
+    def test_mislabeled_rp(self):
+        with pytest.raises(HeaderMismatch):
+            Reader(_kbart_file(RP1_FIELDS), rp=2)
+
+    def test_not_a_kbart_header(self):
+        with pytest.raises(UnrecognizedHeader):
+            Reader(_kbart_file(['My Journal', '1111-2222']))
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+# coding: utf-8
+
+from __future__ import (absolute_import, division,
+                        print_function, unicode_literals)
+
+import pickle
+import unittest
+
+import pytest
+
+from pykbart.constants import RP1_FIELDS, RP2_FIELDS, PROVIDER_FIELDS
+from pykbart.kbartrecord import KbartRecord
+from pykbart.schema import _registry, get_schema, schema_for
+
+
+class TestKbartSchema(unittest.TestCase):
+
+    def test_identical_fields_share_schema(self):
+        assert get_schema(list(RP1_FIELDS)) is get_schema(RP1_FIELDS)
+
+    def test_schema_for_matches_detected_fields(self):
+        schema = schema_for(rp=2, provider='gale')
+        assert schema.fields == RP1_FIELDS + RP2_FIELDS + PROVIDER_FIELDS['gale']
+        assert (schema.rp, schema.provider) == (2, 'gale')
+
+    def test_rp_and_provider_come_from_fields(self):
+        record = KbartRecord(['My Journal'],
+                             fields=RP1_FIELDS + PROVIDER_FIELDS['oclc'])
+        assert (record.rp, record.provider) == (1, 'oclc')
+        custom = KbartRecord(['My Journal'], fields=['title'], rp=1)
+        assert (custom.rp, custom.provider) == (1, None)
+
+    def test_records_share_schema(self):
+        assert KbartRecord(rp=1).fields is KbartRecord(rp=1).fields
+
+    def test_holdings_fields_padded_and_kept_as_read(self):
+        record = KbartRecord(['My Journal', ' 1111-2222', '', ' 2015-01-01 '],
+                             fields=RP1_FIELDS)
+        assert record.holdings_fields == [' 2015-01-01 ', '', '', '', '', '']
+        assert record.print_id == ' 1111-2222'
+
+    def test_strip_whitespace_only_touches_parsed_fields(self):
+        schema = get_schema(RP1_FIELDS, strip_whitespace=True)
+        record = KbartRecord(['My Journal', ' 1111-2222', '', ' 2015-01-01 '],
+                             schema=schema)
+        assert record.start_date == '2015-01-01'
+        assert record.print_id == ' 1111-2222'
+        assert schema is not get_schema(RP1_FIELDS)
+
+    def test_adding_and_removing_fields(self):
+        record = KbartRecord(['My Journal'], rp=1)
+        record['local_note'] = 'Mine'
+        assert record.fields[-1] == 'local_note'
+        del record['coverage_notes']
+        assert 'coverage_notes' not in record
+        assert record['local_note'] == 'Mine'
+        assert len(record) == len(RP1_FIELDS)
+        assert KbartRecord(rp=1).fields == RP1_FIELDS
+
+    def test_pickled_records_share_schema(self):
+        record = KbartRecord(['My Journal'], rp=1)
+        unpickled = pickle.loads(pickle.dumps(record))
+        assert unpickled._schema is record._schema
+        assert unpickled.title == 'My Journal'
+
+    def test_setting_fields_relabels_values(self):
+        record = KbartRecord(['My Journal', '1111-2222'], fields=['a', 'b'])
+        record.fields = ['title', 'issn', 'note']
+        assert record.get_fields('title', 'issn') == ['My Journal', '1111-2222']
+        assert record['note'] == ''
+
+    def test_setting_fewer_fields_than_values(self):
+        record = KbartRecord(['My Journal', '1111-2222'], rp=1)
+        with pytest.raises(ValueError):
+            record.fields = ['title', 'issn']
+        assert record.fields == RP1_FIELDS
+
+    def test_records_changed_the_same_way_share_schema(self):
+        first, second = KbartRecord(rp=1), KbartRecord(rp=1)
+        for record in (first, second):
+            record['local_note'] = 'Mine'
+            del record['coverage_notes']
+            record.fields = list(record.fields) + ['other_note']
+        assert first._schema is second._schema
+        unpickled = pickle.loads(pickle.dumps(first))
+        assert unpickled._schema is first._schema
+
+    def test_changed_fields_are_not_cached_globally(self):
+        cached = len(_registry)
+        for key in ('note_one', 'note_two', 'note_three'):
+            record = KbartRecord(rp=1)
+            record[key] = 'Mine'
+            record.fields = list(record.fields) + ['other_note']
+        assert len(_registry) == cached
+
+
+if __name__ == '__main__':
+    unittest.main()